@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+
+import numpy as np
+from pandas import DataFrame, read_csv
+
+''' NOTES
+
+Shared AS graph index for the as-rel2 scripts. Each link is stored once per
+direction in compressed sparse row (CSR) form: for every kind of neighbor
+(providers, customers, peers) there is an `indptr` array of length n + 1 and an
+`indices` array, so the neighbors of the AS at position i are
+indices[indptr[i]:indptr[i + 1]]. Lookups are O(degree) instead of a full
+DataFrame scan per AS.
+
+Customers: if value is -1 then link is p2c: provider_as gains a customer
+Peers: if value is 0 then link is p2p: both ASes gain a peer
+Providers: if value is -1 then link is p2c: customer_as gains a provider
+'''
+
+
+def read_relationships(path: str) -> DataFrame:
+    '''Load a CAIDA as-rel2 file. Header lines start with "#" and are
+    skipped.'''
+
+    return read_csv(path,
+                    names=['provider_as', 'customer_as', 'value'],
+                    sep='|',
+                    usecols=[0, 1, 2],
+                    comment='#')
+
+
+DEGREES = ['customers', 'providers', 'peers']
+
+# Lower edge of each degree bin and its label, as used in the CAIDA plots:
+EDGES = [0, 1, 2, 6, 101, 501, 1001]
+BINS = ['0', '1', '2-5', '6-100', '101-500', '501-1000', '1000<']
+
+
+def _positions(df: DataFrame) -> tuple:
+    '''Map the AS numbers onto positions 0..n-1. Returns the sorted AS
+    numbers and the provider and customer position of every link.'''
+
+    provider = df.provider_as.to_numpy(dtype=np.int64)
+    customer = df.customer_as.to_numpy(dtype=np.int64)
+    ids, pos = np.unique(np.concatenate([provider, customer]),
+                         return_inverse=True)
+    return ids, pos[:len(provider)], pos[len(provider):]
+
+
+def _counts(src: np.ndarray, dst: np.ndarray, value: np.ndarray,
+            n: int) -> np.ndarray:
+    '''Count every degree kind for every AS in one pass. Each AS occurrence
+    in the link table gets a kind code (customers, providers or peers) and a
+    single bincount over kind * n + position fills all three rows at once.
+    Returns an array of shape (3, n) in DEGREES order.'''
+
+    # p2c: provider_as gains a customer (0), customer_as a provider (1).
+    # p2p: both sides gain a peer (2). Other values are ignored:
+    kind = np.full(2 * len(value), -1)
+    kind[:len(value)][value == -1] = 0
+    kind[len(value):][value == -1] = 1
+    kind[np.concatenate([value == 0, value == 0])] = 2
+
+    pos = np.concatenate([src, dst])
+    keep = kind >= 0
+    return np.bincount(kind[keep] * n + pos[keep],
+                       minlength=3 * n).reshape(3, n)
+
+
+def _table(ids: np.ndarray, counts: np.ndarray) -> DataFrame:
+    table = DataFrame(counts.T, columns=DEGREES,
+                      index=ids).rename_axis('as_id')
+    table.insert(0, 'global', counts.sum(axis=0))
+    return table
+
+
+def degree_table(df: DataFrame) -> DataFrame:
+    '''Customers, providers, peers and global degree (their sum) of every
+    AS, indexed by as_id. Uses the same counts as ASGraph without building the
+    neighbor index.'''
+
+    ids, src, dst = _positions(df)
+    return _table(ids, _counts(src, dst, df.value.to_numpy(), len(ids)))
+
+
+def frequencies(degrees, edges: list = EDGES) -> list:
+    '''Number of ASes in each bin. `edges` holds the lower edge of every
+    bin; the last bin is open-ended and degrees below edges[0] are
+    dropped.'''
+
+    i = np.searchsorted(edges, np.asarray(degrees), side='right') - 1
+    return np.bincount(i[i >= 0], minlength=len(edges)).tolist()
+
+
+CLASSES = ['Content', 'Enterprise', 'Transit/Access']
+
+
+def classify(degrees: DataFrame) -> DataFrame:
+    '''Label each AS from its degree table:
+
+    Enterprise: no customers and no peers
+    Content: no customers and at least one peer
+    Transit/Access: at least one customer'''
+
+    label = np.where(degrees.customers > 0, 'Transit/Access',
+                     np.where(degrees.peers > 0, 'Content', 'Enterprise'))
+    return degrees.assign(type=label)
+
+
+def _csr(src: np.ndarray, dst: np.ndarray, counts: np.ndarray) -> tuple:
+    '''Build (indptr, indices) for the edges src -> dst, where counts holds
+    the number of edges leaving each position. Each neighbor slice is sorted by
+    AS position.'''
+
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr, dst[order]
+
+
+class ASGraph:
+    def __init__(self, df: DataFrame):
+        value = df.value.to_numpy()
+        p2c = value == -1
+        p2p = value == 0
+
+        # Map AS numbers onto positions 0..n-1 and count every degree kind:
+        self.ids, src, dst = _positions(df)
+        self.counts = _counts(src, dst, value, len(self.ids))
+        customers, providers, peers = self.counts
+
+        self.customers_csr = _csr(src[p2c], dst[p2c], customers)
+        self.providers_csr = _csr(dst[p2c], src[p2c], providers)
+        self.peers_csr = _csr(np.concatenate([src[p2p], dst[p2p]]),
+                              np.concatenate([dst[p2p], src[p2p]]),
+                              peers)
+
+        # Global degree counts every link row an AS appears in:
+        self.degree = self.counts.sum(axis=0)
+
+    @classmethod
+    def from_file(cls, path: str):
+        return cls(read_relationships(path))
+
+    def degrees(self) -> DataFrame:
+        '''Same table as degree_table for the indexed links.'''
+
+        return _table(self.ids, self.counts)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, as_id: int) -> int:
+        i = np.searchsorted(self.ids, as_id)
+        if i == len(self.ids) or self.ids[i] != as_id:
+            raise KeyError(f'AS {as_id} is not in the graph')
+        return int(i)
+
+    def _slice(self, csr: tuple, i: int) -> np.ndarray:
+        indptr, indices = csr
+        return indices[indptr[i]:indptr[i + 1]]
+
+    def _neighbors(self, i: int) -> np.ndarray:
+        '''Sorted, distinct neighbor positions of the AS at position i.'''
+
+        return np.unique(np.concatenate([self._slice(self.customers_csr, i),
+                                         self._slice(self.providers_csr, i),
+                                         self._slice(self.peers_csr, i)]))
+
+    def customers(self, as_id: int) -> np.ndarray:
+        return self.ids[self._slice(self.customers_csr, self.position(as_id))]
+
+    def providers(self, as_id: int) -> np.ndarray:
+        return self.ids[self._slice(self.providers_csr, self.position(as_id))]
+
+    def peers(self, as_id: int) -> np.ndarray:
+        return self.ids[self._slice(self.peers_csr, self.position(as_id))]
+
+    def neighbors(self, as_id: int) -> np.ndarray:
+        return self.ids[self._neighbors(self.position(as_id))]
+
+    def rank(self) -> DataFrame:
+        '''Rank every AS by global degree, highest first. Ties are broken by
+        the lower AS number so the order is stable between runs.'''
+
+        order = np.lexsort((self.ids, -self.degree))
+        return DataFrame({'as_id': self.ids[order],
+                          'members': self.degree[order]})
+
+    def _adjacent(self, i: int, members: list) -> bool:
+        return bool(np.isin(members, self._neighbors(i)).all())
+
+    def tier1_clique(self, k: int = 50, seed: int = 10) -> np.ndarray:
+        '''Infer the Tier-1 clique among the top-k ranked ASes. The largest
+        clique among the top `seed` ASes is found exactly (Bron-Kerbosch), then
+        the remaining top-k ASes are added greedily in rank order if they
+        connect to every current member. Returns the member AS numbers in rank
+        order.'''
+
+        top = np.searchsorted(self.ids, self.rank().as_id.to_numpy()[:k])
+        head = [int(i) for i in top[:seed]]
+
+        # Adjacency of the seed ASes as sets of positions:
+        adj = {i: set(self._neighbors(i).tolist()) & set(head) for i in head}
+        best = []
+
+        def expand(r: list, p: list, x: set):
+            nonlocal best
+            if not p and not x:
+                if len(r) > len(best):
+                    best = r
+                return
+            for v in list(p):
+                expand(r + [v], [u for u in p if u in adj[v]], x & adj[v])
+                p.remove(v)
+                x = x | {v}
+
+        expand([], list(head), set())
+
+        members = sorted(best, key=head.index)
+        for i in top[seed:]:
+            if self._adjacent(int(i), members):
+                members.append(int(i))
+
+        return self.ids[members]
@@ -1,57 +1,39 @@
 #!/usr/bin/env python
 
-from pandas import DataFrame, Series, concat, read_csv
+from pandas import DataFrame
 from matplotlib import pyplot
 
+from asgraph import BINS, degree_table, frequencies, read_relationships
+
 ''' NOTES
 
 Customers: if value is -1 then link is p2c: count provider_as
 Peers: if value is 0 then link is p2p: count customer_as and provider_as
 Providers: if value is -1 then link is p2c: count customer_as
 Global: count customer_as and provider_as
-'''
-
-
-def frequencies(series: Series) -> list:
-    '''I tried to use hist plot but cannot get custom bins to work. Instead, I
-    create a total for each bin and make a new DataFrame to plot. For
-    temp[temp == X], the inner temp == X returns the rows that equal X, these
-    are then filtered in by the outer temp. len then gives you the total in the
-    pandas Series.'''
-
-    return [len(series[series == 0]),
-            len(series[series == 1]),
-            len(series[series.between(2, 5)]),
-            len(series[series.between(6, 100)]),
-            len(series[series.between(101, 500)]),
-            len(series[series.between(501, 1000)]),
-            len(series[series > 1000])]
 
+All four degree kinds come from a single pass over the link table (see
+degree_table in asgraph.py). Each plot bins the per-AS degrees of one kind.
+'''
 
 # Load Data:
-df = read_csv('20241101.as-rel2.txt',
-              names=['provider_as', 'customer_as', 'value'],  # column names
-              sep='|',            # column separator
-              usecols=[0, 1, 2])  # columns to keep
+df = read_relationships('20241101.as-rel2.txt')
+degrees = degree_table(df)
 
 # FIGURE
 
-# Nominal bins:
-bins = ['0', '1', '2-5', '6-100', '101-500', '501-1000', '1000<']
-
 # Create a 2x2 figure with subplots:
 figure, plots = pyplot.subplots(nrows=2, ncols=2, figsize=(12, 6))
 
 # PLOT 1
 
-temp = concat([df.provider_as, df.customer_as])
-temp = DataFrame({'value': bins, 'freq': frequencies(temp)})
+temp = DataFrame({'value': BINS, 'freq': frequencies(degrees['global'])})
 
 temp.plot.bar(ax=plots[0][0],
               x='value',
-              xlabel='AS ID',
+              xlabel='number of distinct links',
               y='freq',
-              ylabel='number of distinct links',
+              ylabel='number of ASes',
               logy=True,
               color='black',
               rot=0,
@@ -59,14 +41,13 @@ temp.plot.bar(ax=plots[0][0],
 
 # PLOT 2
 
-temp = df.query('value == -1').provider_as
-temp = DataFrame({'value': bins, 'freq': frequencies(temp)})
+temp = DataFrame({'value': BINS, 'freq': frequencies(degrees.customers)})
 
 temp.plot.bar(ax=plots[0][1],
               x='value',
-              xlabel='AS ID',
+              xlabel='number of direct customers',
               y='freq',
-              ylabel='number of direct customers',
+              ylabel='number of ASes',
               logy=True,
               color='black',
               rot=0,
@@ -74,15 +55,13 @@ temp.plot.bar(ax=plots[0][1],
 
 # PLOT 3
 
-temp = df.query('value == 0')
-temp = concat([temp.provider_as, temp.customer_as])
-temp = DataFrame({'value': bins, 'freq': frequencies(temp)})
+temp = DataFrame({'value': BINS, 'freq': frequencies(degrees.peers)})
 
 temp.plot.bar(ax=plots[1][0],
               x='value',
-              xlabel='AS ID',
+              xlabel='number of peers',
               y='freq',
-              ylabel='number of peers',
+              ylabel='number of ASes',
               logy=True,
               color='dimgrey',
               rot=0,
@@ -90,14 +69,13 @@ temp.plot.bar(ax=plots[1][0],
 
 # PLOT 4
 
-temp = df.query('value == -1').customer_as
-temp = DataFrame({'value': bins, 'freq': frequencies(temp)})
+temp = DataFrame({'value': BINS, 'freq': frequencies(degrees.providers)})
 
 temp.plot.bar(ax=plots[1][1],
               x='value',
-              xlabel='AS ID',
+              xlabel='number of providers',
               y='freq',
-              ylabel='number of providers',
+              ylabel='number of ASes',
               logy=True,
               color='silver',
               rot=0,
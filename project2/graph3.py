@@ -1,45 +1,19 @@
 #!/usr/bin/env python
 
-from pandas import DataFrame, read_csv, to_numeric
+from pandas import DataFrame
+
+from pfx2as import BINS, space_by_as, space_by_bin
 
 # GRAPH 3
 
-df = read_csv('routeviews-rv2-20241106-1400.pfx2as.txt',
-              names=['prefix', 'as_id'],  # column names
-              sep='\t',                   # column separator
-              usecols=[1, 2])             # columns to keep
-
-# Remove rows with non-numeric characters in AS column:
-df.as_id = df.as_id.apply(lambda x: to_numeric(x, errors='coerce'))
-df = df.dropna()
-
-# Calculate IP space per discussion post instructions:
-df['ip_space'] = df.prefix.apply(lambda x: 2**(32 - x))
-
-# Dervice the total IP space for each AS:
-bins = ['<4',
-        '4-8',
-        '8-12',
-        '12-16',
-        '16-20',
-        '20-24',
-        '24-28',
-        '28-32',
-        '32-36',
-        '36<']
-
-freq = [df[df.as_id < 4000].ip_space.sum(),
-        df[df.as_id.between(4001, 8000)].ip_space.sum(),
-        df[df.as_id.between(8001, 12000)].ip_space.sum(),
-        df[df.as_id.between(12001, 16000)].ip_space.sum(),
-        df[df.as_id.between(16001, 20000)].ip_space.sum(),
-        df[df.as_id.between(20001, 24000)].ip_space.sum(),
-        df[df.as_id.between(24001, 28000)].ip_space.sum(),
-        df[df.as_id.between(28001, 32000)].ip_space.sum(),
-        df[df.as_id.between(32001, 36000)].ip_space.sum(),
-        df[df.as_id > 36000].ip_space.sum()]
-
-temp = DataFrame({'value': bins, 'freq': freq})
+# Total IP space for each AS, read in chunks. Prefixes with several origin
+# ASes are dropped and nested prefixes are counted once (see pfx2as.py):
+space = space_by_as('routeviews-rv2-20241106-1400.pfx2as.txt',
+                    moas='drop',
+                    exact=True)
+
+# Derive the total IP space for each AS number bin:
+temp = DataFrame({'value': BINS, 'freq': space_by_bin(space)})
 temp.freq = temp.freq / (1 * 10**9)  # adjust values to correspond to yticks
 
 plot = temp.plot.bar(
@@ -1,17 +1,24 @@
 #!/usr/bin/env python
 
-from pandas import DataFrame, read_csv
+from pandas import read_csv
+
+from asgraph import classify, degree_table, read_relationships
 
 
 ''' NOTES
 
 It seems like the professor wants us to compare the data from 2021 with 2024.
 This seems like the only way to get the types for each AS. Since he just wants
-totals, not actual AS values or details, I decided to just count the AS numbers
-from 2024 that appear in 2021 under certain conditions.
+totals, not actual AS values or details, I decided to classify the ASes listed
+in 2021 by their links in 2024.
+
+Enterprise: no customers and no peers
+Content: no customers and at least one peer
+Transit/Access: at least one customer
 
-The alternative is to do a bunch of join logic that would combine the
-DataFrames. I think this way is more straightforward.
+The customer and peer counts come from one pass over the 2024 links (see
+degree_table in asgraph.py). ASes from 2021 with no 2024 links get zero counts
+and end up as Enterprise.
 '''
 
 # GRAPH 4 CLASSIFICAITON PIE CHART RECREATED
@@ -21,47 +28,18 @@ df21 = read_csv('20210401.as2types.txt',
                 sep='|',
                 skiprows=6)
 
-df24 = read_csv('20241101.as-rel2.txt',
-                names=['provider_as', 'customer_as', 'value'],  # column names
-                sep='|',            # column separator
-                usecols=[0, 1, 2])  # columns to keep
-
-# SLICE 1
-
-# Create subset of "any ASes without customers or peers":
-subset = df24.query('value == -1').provider_as.unique()
-
-# Find ASes that don't appear in the 2024 subset (i.e., no customers or peers).
-# `df21['as_id'].isin(subset)` returns "True" or "False" for each index.
-# The tilde (~) inverts those booleans, kind of how `not True` returns `False`.
-# I then use those inverted booleans, which are indexed, to get the ASes that
-# are in 2021 but not 2024:
-enterprise = len(df21[~df21['as_id'].isin(subset)])
-
-# SLICE 2
-
-# Create subset of "any AS with no customers and at least one peer":
-subset = (df24.query('value == 0').groupby('provider_as').count().reset_index()
-          .query('customer_as > 1').provider_as)
-
-# Find ASes that are in subset:
-content = len(df21[df21['as_id'].isin(subset)])
-
-# SLICE 3
-
-# Create subset of "any AS with at least one customer":
-subset = (df24.query('value == -1').groupby('provider_as').count().reset_index()
-          .query('customer_as > 0').provider_as)
+df24 = read_relationships('20241101.as-rel2.txt')
 
-# Find ASes that are in subset:
-transit = len(df21[df21['as_id'].isin(subset)])
+# Per-AS degrees for every 2021 AS, zero where it has no 2024 links:
+degrees = degree_table(df24).reindex(df21.as_id.unique(), fill_value=0)
 
 # COMBINE SLICES AND PLOT
 
-dfpie = DataFrame({'type': ['Enterprise', 'Content', 'Transit/Access'],
-                   'count': [enterprise, content, transit]})
+dfpie = (classify(degrees).groupby('type').size()
+         .reindex(['Enterprise', 'Content', 'Transit/Access'], fill_value=0)
+         .rename('count').to_frame())
 
-plot = dfpie.set_index('type').plot.pie(
+plot = dfpie.plot.pie(
     title='AS Classes 2024',
     y='count',
     ylabel='percent',
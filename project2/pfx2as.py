@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+
+import numpy as np
+from pandas import Series, read_csv, to_numeric
+
+''' NOTES
+
+Streaming reader for RouteViews pfx2as files (network, prefix length, origin
+AS). The file is read in chunks so memory stays bounded no matter how large it
+is, and every step is vectorized over the chunk.
+
+MOAS: an origin field can hold several ASes, separated by "_" (multi-origin)
+or "," (AS set). The `moas` argument decides what happens to those prefixes:
+
+drop: skip them (the original graph 3 behavior)
+split: divide the prefix space evenly between the origins
+each: credit the full prefix space to every origin
+
+Nested prefixes announced by the same AS (e.g. a /16 and a /24 inside it) are
+counted twice by default. With exact=True the covered intervals of each AS are
+merged first, so every address is counted at most once per AS. The merge runs
+after every chunk, so exact mode only carries the disjoint intervals seen so
+far rather than every prefix in the file.
+'''
+
+CHUNKSIZE = 1_000_000  # rows per chunk
+
+MOAS = ['drop', 'split', 'each']
+
+# Lower edge of each AS number bin and its label (thousands):
+EDGES = [0, 4001, 8001, 12001, 16001, 20001, 24001, 28001, 32001, 36001]
+BINS = ['<4', '4-8', '8-12', '12-16', '16-20', '20-24', '24-28', '28-32',
+        '32-36', '36<']
+
+
+def read_pfx2as(path: str, chunksize: int = CHUNKSIZE, moas: str = 'drop'):
+    '''Yield DataFrame chunks with one row per (prefix, origin AS) and the
+    columns network, length, as_id and weight (the share of the prefix space
+    credited to that AS).'''
+
+    if moas not in MOAS:
+        raise ValueError(f'expecting moas in {MOAS}, but got {moas!r}')
+
+    for chunk in read_csv(path,
+                          names=['network', 'length', 'as_id'],
+                          sep='\t',
+                          dtype={'network': str, 'length': 'int64',
+                                 'as_id': str},
+                          chunksize=chunksize):
+
+        origins = chunk.as_id.str.split('[_,]', regex=True)
+
+        if moas == 'drop':
+            single = origins.str.len() == 1
+            chunk, origins = chunk[single], origins[single]
+
+        chunk = chunk.assign(as_id=origins).explode('as_id')
+
+        # Remove rows with non-numeric characters in AS column:
+        chunk['as_id'] = to_numeric(chunk.as_id, errors='coerce')
+        chunk = chunk.dropna(subset=['as_id'])
+        if chunk.empty:
+            continue
+        chunk['as_id'] = chunk.as_id.astype('int64')
+
+        # Share the prefix between the origins that are left (rows of one
+        # prefix keep the same index after explode):
+        chunk['weight'] = (1 / chunk.groupby(level=0).as_id.transform('size')
+                           if moas == 'split' else 1.0)
+
+        yield chunk
+
+
+def _intervals(chunk) -> tuple:
+    '''First and one-past-last address of each prefix as integers.'''
+
+    octets = (chunk.network.str.split('.', expand=True).astype('int64')
+              .to_numpy())
+    start = octets @ np.array([2**24, 2**16, 2**8, 1], dtype=np.int64)
+    return start, start + 2**(32 - chunk.length.to_numpy())
+
+
+def _merge(as_id, start, end) -> tuple:
+    '''Merge overlapping or touching intervals of the same AS. After sorting
+    by (as_id, start), an interval starts a new block unless it begins before
+    the furthest end seen so far within its AS. Returns the disjoint
+    intervals as (as_id, start, end).'''
+
+    if len(as_id) == 0:
+        return as_id, start, end
+
+    order = np.lexsort((start, as_id))
+    as_id, start, end = as_id[order], start[order], end[order]
+
+    reach = Series(end).groupby(as_id).cummax().to_numpy()
+    new = np.ones(len(as_id), dtype=bool)
+    new[1:] = (as_id[1:] != as_id[:-1]) | (start[1:] > reach[:-1])
+
+    first = np.flatnonzero(new)
+    return as_id[first], start[first], np.maximum.reduceat(end, first)
+
+
+def space_by_as(path: str, chunksize: int = CHUNKSIZE, moas: str = 'drop',
+                exact: bool = False) -> Series:
+    '''Total IP space originated by each AS, indexed by as_id.'''
+
+    if exact and moas == 'split':
+        raise ValueError('exact mode cannot split MOAS prefixes, '
+                         'use moas="drop" or moas="each"')
+
+    total = Series(dtype=float)
+    merged = (np.empty(0, dtype=np.int64),) * 3
+
+    for chunk in read_pfx2as(path, chunksize, moas):
+        if exact:
+            # Carry only the disjoint intervals merged so far:
+            start, end = _intervals(chunk)
+            merged = _merge(*(np.concatenate(pair) for pair in
+                              zip(merged, (chunk.as_id.to_numpy(), start,
+                                           end))))
+        else:
+            space = 2.0**(32 - chunk.length) * chunk.weight
+            total = total.add(space.groupby(chunk.as_id).sum(),
+                              fill_value=0)
+
+    if exact:
+        as_id, start, end = merged
+        return (Series(end - start, index=as_id).groupby(level=0).sum()
+                .astype(float))
+
+    return total
+
+
+def space_by_bin(space: Series, edges: list = EDGES) -> list:
+    '''Sum per-AS space into AS number bins. `edges` holds the lower edge of
+    every bin; the last bin is open-ended.'''
+
+    i = np.searchsorted(edges, space.index.to_numpy(), side='right') - 1
+    keep = i >= 0
+    return np.bincount(i[keep], weights=space.to_numpy()[keep],
+                       minlength=len(edges)).tolist()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from pandas import DataFrame, concat, read_csv
+from asgraph import ASGraph
 
 ''' NOTES
 
@@ -8,39 +8,28 @@ Customers: if value is -1 then link is p2c: count provider_as
 Peers: if value is 0 then link is p2p: count customer_as and provider_as
 Providers: if value is -1 then link is p2c: count customer_as
 Global: count customer_as and provider_as
-'''
-
-# ETL
 
-df = read_csv('20241101.as-rel2.txt',
-              names=['provider_as', 'customer_as', 'value'],  # column names
-              sep='|',            # column separator
-              usecols=[0, 1, 2])  # columns to keep
+The neighbor lookups and clique check run on the CSR index in asgraph.py, so
+the whole graph is ranked and only the clique search is limited to the top k.
+The clique_1 column keeps its old name but now marks Tier-1 clique members
+(see tier1_clique in asgraph.py) instead of neighbors of the #1 AS.
+'''
 
+TOP = 50  # ASes considered for the Tier-1 clique
 
-g_rank = DataFrame({'as_id': concat([df.provider_as, df.customer_as]),
-                    'members': 1})
+# ETL
 
-g_rank = (g_rank.groupby('as_id').count()           # count connections
-          .sort_values('members', ascending=False)  # rank by count
-          .reset_index()[:50])                      # only need top 50
+graph = ASGraph.from_file('20241101.as-rel2.txt')
 
-# Filter and save each distinct as_id value in the original data
-# that corresponds to each as_id in the top-50 list:
-g_rank['conn'] = g_rank.as_id.apply(
-    lambda x: set(df[df.provider_as == x].customer_as.to_list() +
-                  df[df.customer_as == x].provider_as.to_list()),
-    )
+g_rank = graph.rank()  # every AS ranked by number of connections
 
 print('AS ID Global Rankings\n')
 print(g_rank.head(5))  # top 5 rows sample
 print()
 
-clique = g_rank.iloc[0].conn  # the as_id #1 clique
-
-# Check if each as_id in the top 50 is the #1 as_id's connections:
-g_rank['clique_1'] = g_rank.apply(lambda x: x.as_id in clique, axis=1)
-g_rank.loc[0, 'clique_1'] = True  # set to True since as_id #1 is the root
+# Mark the ASes that form the Tier-1 clique among the top ranked ASes:
+clique = graph.tier1_clique(k=TOP)
+g_rank['clique_1'] = g_rank.as_id.isin(clique)
 
 # CREATE API STRING FOR CAIDA.ORG
 
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from pandas import DataFrame, concat, read_csv, to_datetime
+
+from asgraph import (CLASSES, DEGREES, classify, degree_table,
+                     read_relationships)
+
+''' NOTES
+
+Batch version of graphs 1 and 4 for a directory of dated CAIDA snapshots, e.g.
+20150801.as2types.txt and 20241101.as-rel2.txt (.gz and .bz2 also work).
+
+as2types: class shares as published by CAIDA
+as-rel2: class shares inferred from the links (see classify in asgraph.py)
+         plus summary statistics of every degree kind
+
+Each snapshot is summarized in its own process and the summary is cached as
+<cache>/<file name>.v<VERSION>.csv. A cached summary is reused until the
+snapshot file is newer than it, so adding a month only processes that month.
+Bump VERSION whenever summarize, classify or degree_table change what a
+summary holds, so every snapshot is processed again.
+
+The output is tidy: one row per date, source, metric, item and value.
+'''
+
+VERSION = 2  # summary format, part of every cache file name
+
+SNAPSHOT = re.compile(r'^(\d{8})\.(as2types|as-rel2)\.txt(\.gz|\.bz2)?$')
+
+
+def read_types(path: str) -> DataFrame:
+    '''Load a CAIDA as2types file. Header lines start with "#" and are
+    skipped.'''
+
+    return read_csv(path, names=['as_id', 'source', 'type'], sep='|',
+                    comment='#')
+
+
+def summarize(path: str) -> DataFrame:
+    date, source = SNAPSHOT.match(os.path.basename(path)).group(1, 2)
+    rows = []
+
+    if source == 'as2types':
+        types = read_types(path).type
+    else:
+        degrees = degree_table(read_relationships(path))
+        types = classify(degrees).type
+
+        for kind in ['global'] + DEGREES:
+            rows += [('mean', kind, degrees[kind].mean()),
+                     ('median', kind, degrees[kind].median()),
+                     ('max', kind, degrees[kind].max())]
+
+    rows.append(('count', 'ases', len(types)))
+    # Every class gets a row, 0 where a snapshot has none of it:
+    shares = types.value_counts(normalize=True).reindex(CLASSES, fill_value=0)
+    rows += [('share', name, share) for name, share in shares.items()]
+
+    summary = DataFrame(rows, columns=['metric', 'item', 'value'])
+    summary.insert(0, 'source', source)
+    summary.insert(0, 'date', date)
+    return summary
+
+
+def timeseries(directory: str, cache: str = None,
+               workers: int = None) -> DataFrame:
+    '''Summarize every snapshot in `directory`, reusing cached summaries, and
+    return them as one time series sorted by date.'''
+
+    cache = cache or os.path.join(directory, '.cache')
+    os.makedirs(cache, exist_ok=True)
+
+    paths = sorted(os.path.join(directory, f) for f in os.listdir(directory)
+                   if SNAPSHOT.match(f))
+    cached = {p: os.path.join(cache,
+                              f'{os.path.basename(p)}.v{VERSION}.csv')
+              for p in paths}
+
+    pending = [p for p in paths
+               if not os.path.exists(cached[p]) or
+               os.path.getmtime(cached[p]) < os.path.getmtime(p)]
+
+    if pending:
+        with ProcessPoolExecutor(workers) as pool:
+            for path, summary in zip(pending, pool.map(summarize, pending)):
+                summary.to_csv(cached[path], index=False)
+
+    if not paths:
+        return DataFrame(columns=['date', 'source', 'metric', 'item',
+                                  'value'])
+
+    df = concat([read_csv(cached[p], dtype={'date': str}) for p in paths],
+                ignore_index=True)
+    df['date'] = to_datetime(df.date, format='%Y%m%d')
+    return df.sort_values(['date', 'source', 'metric', 'item'],
+                          ignore_index=True)
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else '.'
+
+    print(f'Processing snapshots in {directory}...')
+
+    df = timeseries(directory)
+    df.to_csv('6_AS_timeseries.csv', index=False)
+
+    print(df.query('metric == "share"')
+          .pivot_table(index='date', columns=['source', 'item'],
+                       values='value'))
+    print()
+    print('Success.')
+
+
+if __name__ == '__main__':
+    main()